@@ -15,12 +15,61 @@
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
 #
 # ##### END GPL LICENSE BLOCK #####
+import collections
+import concurrent.futures
 import configparser
+import ctypes
+import hashlib
 import itertools
+import mmap
+import os
 import subprocess
-from typing import Callable, List, Optional, Set
+import sys
+import tempfile
+from typing import Callable, List, NamedTuple, Optional, Set
 
 NORMAL_IMAGES_LIST_JSON = 'bl_importer_converted_normal_images.json'
+CONVERSION_MANIFEST_JSON = 'bl_importer_conversion_manifest.json'
+
+ALBEDO_ROLE = 'ALBEDO'
+METALLIC_ROUGHNESS_ROLE = 'METALLIC_ROUGHNESS'
+NORMAL_ROLE = 'NORMAL'
+
+# used when the format of the original dds file cannot be determined
+DEFAULT_DDS_FORMATS = {
+    ALBEDO_ROLE: 'BC7_UNORM_SRGB',
+    METALLIC_ROUGHNESS_ROLE: 'BC7_UNORM',
+    NORMAL_ROLE: 'BC5_UNORM',
+}
+
+DXGI_FORMAT_NAMES = {
+    28: 'R8G8B8A8_UNORM',
+    29: 'R8G8B8A8_UNORM_SRGB',
+    71: 'BC1_UNORM',
+    72: 'BC1_UNORM_SRGB',
+    74: 'BC2_UNORM',
+    75: 'BC2_UNORM_SRGB',
+    77: 'BC3_UNORM',
+    78: 'BC3_UNORM_SRGB',
+    80: 'BC4_UNORM',
+    81: 'BC4_SNORM',
+    83: 'BC5_UNORM',
+    84: 'BC5_SNORM',
+    95: 'BC6H_UF16',
+    96: 'BC6H_SF16',
+    98: 'BC7_UNORM',
+    99: 'BC7_UNORM_SRGB',
+}
+
+FOURCC_FORMAT_NAMES = {
+    b'DXT1': 'BC1_UNORM',
+    b'DXT3': 'BC2_UNORM',
+    b'DXT5': 'BC3_UNORM',
+    b'ATI1': 'BC4_UNORM',
+    b'BC4U': 'BC4_UNORM',
+    b'ATI2': 'BC5_UNORM',
+    b'BC5U': 'BC5_UNORM',
+}
 
 BLEND_METHOD_CONVERSION = {
     'OPAQUE': 'OPAQUE',
@@ -46,123 +95,340 @@ import pathlib
 import struct
 
 import bpy
-import bmesh
 
 import numpy as np
 from bpy_extras.io_utils import ImportHelper
 from bpy.props import StringProperty, BoolProperty, EnumProperty
 from bpy.types import Operator, AddonPreferences
 
-STRUCT_INDEX = struct.Struct('H')
-STRUCT_VEC2 = struct.Struct('ee')
-STRUCT_VEC3 = struct.Struct('fff')
+ID_PROPERTY = 'msfs_gltf_id'
+HASH_PROPERTY = 'msfs_gltf_hash'
+NORMAL_CONVERTED_PROPERTY = 'msfs_gltf_normal_converted'
+TEMPLATE_PROPERTY = 'msfs_gltf_template'
+
+MSFS_PBR_NODE_GROUP = 'MSFS PBR'
+# increase when the node group layout changes to rebuild existing materials
+MATERIAL_TEMPLATE_VERSION = 1
+
+GLB_MAGIC = b'glTF'
+GLB_CHUNK_JSON = 0x4E4F534A
+GLB_CHUNK_BIN = 0x004E4942
+STRUCT_GLB_HEADER = struct.Struct('<4sII')
+STRUCT_GLB_CHUNK_HEADER = struct.Struct('<II')
+
+COMPONENT_DTYPES = {
+    5120: np.int8,
+    5121: np.uint8,
+    5122: np.int16,
+    5123: np.uint16,
+    5125: np.uint32,
+    5126: np.float32,
+    5131: np.float16,  # half float used by Asobo
+}
+
+TYPE_COMPONENTS = {
+    'SCALAR': 1,
+    'VEC2': 2,
+    'VEC3': 3,
+    'VEC4': 4,
+    'MAT2': 4,
+    'MAT3': 9,
+    'MAT4': 16,
+}
+
+
+def gltf_identity(gltf_file, kind: str, index: int, name: str) -> str:
+    gltf_path = pathlib.Path(gltf_file).resolve().as_posix()
+    return f'{gltf_path}|{kind}|{index}|{name}'
+
 
+def index_existing(datablocks) -> dict:
+    return {
+        datablock[ID_PROPERTY]: datablock
+        for datablock in datablocks
+        if ID_PROPERTY in datablock
+    }
 
-def sub_buffer_from_view(buffer, buffer_view) -> list:
-    start = buffer_view['byteOffset']
-    end = start + buffer_view['byteLength']
-    return buffer[start:end]
 
+def hash_data(*chunks) -> str:
+    digest = hashlib.sha1()
+    for chunk in chunks:
+        digest.update(chunk)
+    return digest.hexdigest()
 
-def get_start_indices(accessor, stride) -> list:
+
+def hash_file(file_path: pathlib.Path) -> str:
+    digest = hashlib.sha1()
+    with open(file_path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def accessor_format(accessor) -> tuple:
     try:
-        start = accessor['byteOffset']
+        dtype = np.dtype(COMPONENT_DTYPES[accessor['componentType']])
+        components = TYPE_COMPONENTS[accessor['type']]
     except KeyError:
-        start = 0
-    count = accessor['count']
-    end = start + count * stride
-    return [i for i in range(start, end, stride)]
+        raise ValueError(
+            f"unsupported accessor format {accessor.get('componentType')} "
+            f"{accessor.get('type')}")
+    return dtype.newbyteorder('<'), components
+
+
+def view_bytes(buffer, buffer_view, byte_offset, count, element_size,
+               stride) -> memoryview:
+    start = buffer_view.get('byteOffset', 0) + byte_offset
+    end = start + max(count - 1, 0) * stride + element_size
+    return memoryview(buffer)[start:end]
+
+
+def accessor_bytes(buffer, gltf, accessor) -> list:
+    dtype, components = accessor_format(accessor)
+    element_size = dtype.itemsize * components
+    chunks = []
+    if 'bufferView' in accessor:
+        buffer_view = gltf['bufferViews'][accessor['bufferView']]
+        stride = buffer_view.get('byteStride', element_size)
+        chunks.append(view_bytes(buffer, buffer_view,
+                                 accessor.get('byteOffset', 0),
+                                 accessor['count'], element_size, stride))
+
+    sparse = accessor.get('sparse')
+    if sparse:
+        # sparse indices and values are tightly packed
+        sparse_indices = sparse['indices']
+        index_dtype, _ = accessor_format(
+            {'componentType': sparse_indices['componentType'],
+             'type': 'SCALAR'})
+        for part, size in ((sparse_indices, index_dtype.itemsize),
+                           (sparse['values'], element_size)):
+            buffer_view = gltf['bufferViews'][part['bufferView']]
+            chunks.append(view_bytes(buffer, buffer_view,
+                                     part.get('byteOffset', 0),
+                                     sparse['count'], size, size))
+    return chunks
+
+
+def mesh_hash(buffer, gltf, gltf_mesh, material_names) -> str:
+    chunks = [json.dumps(gltf_mesh, sort_keys=True).encode()]
+    for primitive in gltf_mesh['primitives']:
+        accessor_indices = list(primitive['attributes'].values())
+        if 'indices' in primitive:
+            accessor_indices.append(primitive['indices'])
+        for i in accessor_indices:
+            accessor = gltf['accessors'][i]
+            chunks.append(json.dumps(accessor, sort_keys=True).encode())
+            chunks.extend(accessor_bytes(buffer, gltf, accessor))
+        # rebuilt meshes must pick up newly created material datablocks
+        chunks.append(material_names[primitive['material']].encode())
+    return hash_data(*chunks)
+
+
+def try_mesh_hash(buffer, gltf, gltf_mesh, material_names) -> Optional[str]:
+    try:
+        return mesh_hash(buffer, gltf, gltf_mesh, material_names)
+    except (KeyError, IndexError, ValueError):
+        return None
+
 
+def read_buffer_view(gltf, buffer, buffer_view_index, byte_offset, count,
+                     dtype, components, packed=False) -> np.ndarray:
+    buffer_view = gltf['bufferViews'][buffer_view_index]
+    element_size = dtype.itemsize * components
+    if packed:
+        stride = element_size
+    else:
+        stride = buffer_view.get('byteStride', element_size)
+    if count == 0:
+        return np.empty((0, components), dtype)
 
-def get_indices(accessor_indices, buffer_indices) -> list:
+    # checking the whole range once instead of every element
+    view_start = buffer_view.get('byteOffset', 0)
+    view_end = view_start + buffer_view['byteLength']
+    start = view_start + byte_offset
+    end = start + (count - 1) * stride + element_size
+    if stride < element_size or view_end > len(buffer) or end > view_end:
+        raise ValueError(
+            f"accessor data exceeds buffer view {buffer_view_index}")
+
+    # a strided view into the buffer without copying any data
+    return np.ndarray((count, components), dtype, buffer=buffer,
+                      offset=start, strides=(stride, dtype.itemsize))
+
+
+def normalize_values(values: np.ndarray) -> np.ndarray:
+    max_value = np.float32(np.iinfo(values.dtype).max)
+    return np.maximum(values / max_value, -1.0).astype(np.float32)
+
+
+def read_accessor(gltf, buffer, accessor) -> np.ndarray:
+    dtype, components = accessor_format(accessor)
+    count = accessor['count']
+    sparse = accessor.get('sparse')
+
+    if 'bufferView' in accessor:
+        values = read_buffer_view(gltf, buffer, accessor['bufferView'],
+                                  accessor.get('byteOffset', 0), count,
+                                  dtype, components)
+        if sparse:
+            values = values.copy()
+    else:
+        values = np.zeros((count, components), dtype)
+
+    if sparse:
+        sparse_count = sparse['count']
+        sparse_indices = sparse['indices']
+        index_dtype, _ = accessor_format(
+            {'componentType': sparse_indices['componentType'],
+             'type': 'SCALAR'})
+        indices = read_buffer_view(
+            gltf, buffer, sparse_indices['bufferView'],
+            sparse_indices.get('byteOffset', 0), sparse_count, index_dtype,
+            1, packed=True)[:, 0]
+        if sparse_count and indices.max() >= count:
+            raise ValueError("sparse accessor index out of range")
+        sparse_values = sparse['values']
+        values[indices] = read_buffer_view(
+            gltf, buffer, sparse_values['bufferView'],
+            sparse_values.get('byteOffset', 0), sparse_count, dtype,
+            components, packed=True)
+
+    if accessor.get('normalized', False):
+        return normalize_values(values)
+    return values
+
+
+def to_blender_axes(vectors: np.ndarray) -> np.ndarray:
+    # converting to blender z up world
+    return np.stack((vectors[:, 0], -vectors[:, 2], vectors[:, 1]), axis=1)
+
+
+def read_shading_attribute(gltf, buffer, primitive, name, vertex_count,
+                           components, default) -> Optional[np.ndarray]:
     try:
-        start = accessor_indices['byteOffset']
+        accessor = gltf['accessors'][primitive['attributes'][name]]
     except KeyError:
-        start = 0
-    end = start + accessor_indices['count'] * STRUCT_INDEX.size
-    return [
-        STRUCT_INDEX.unpack(buffer_indices[i:i + STRUCT_INDEX.size])[0]
-        for i in range(start, end, STRUCT_INDEX.size)
-    ]
+        return None
+    values = read_accessor(gltf, buffer, accessor)[:, :components].astype(
+        np.float32)
+    if values.shape[1] < components:
+        padding = np.full(
+            (vertex_count, components - values.shape[1]), default,
+            np.float32)
+        values = np.hstack((values, padding))
+    return values
+
+
+def read_shading_attributes(gltf, buffer, primitive,
+                            vertex_count) -> tuple:
+    normals = read_shading_attribute(
+        gltf, buffer, primitive, 'NORMAL', vertex_count, 3, 0.0)
+    if normals is not None:
+        normals = to_blender_axes(normals)
+
+    tangents = read_shading_attribute(
+        gltf, buffer, primitive, 'TANGENT', vertex_count, 4, 1.0)
+    if tangents is not None:
+        tangents = np.hstack((to_blender_axes(tangents), tangents[:, 3:]))
+
+    colors = read_shading_attribute(
+        gltf, buffer, primitive, 'COLOR_0', vertex_count, 4, 1.0)
+    return normals, tangents, colors
 
 
 def read_primitive(gltf, buffer, selected):
     attributes = selected['attributes']
+    accessors = gltf['accessors']
 
-    accessor_pos = gltf['accessors'][attributes['POSITION']]
-    accessor_texcoord_0 = gltf['accessors'][attributes['TEXCOORD_0']]
-    accessor_texcoord_1 = gltf['accessors'][attributes['TEXCOORD_1']]
-    accessor_indices = gltf['accessors'][selected['indices']]
-    buffer_view_indices = gltf['bufferViews'][accessor_indices['bufferView']]
-    # TODO separate buffer views and buffers per accessor since they can
-    #  potentially be different
-    buffer_view_data = gltf['bufferViews'][accessor_pos['bufferView']]
-    buffer_indices = sub_buffer_from_view(buffer, buffer_view_indices)
-    buffer_data = sub_buffer_from_view(buffer, buffer_view_data)
-
-    indices = get_indices(accessor_indices, buffer_indices)
-
-    pos_starts = get_start_indices(
-        accessor_pos, buffer_view_data['byteStride'])
-    texcoord_0_starts = get_start_indices(
-        accessor_texcoord_0, buffer_view_data['byteStride'])
-    texcoord_1_starts = get_start_indices(
-        accessor_texcoord_1, buffer_view_data['byteStride'])
-
-    pos_values = [
-        STRUCT_VEC3.unpack(buffer_data[i:i + STRUCT_VEC3.size])
-        for i in pos_starts]
-    texcoord_0_values = [
-        STRUCT_VEC2.unpack(buffer_data[i:i + STRUCT_VEC2.size])
-        for i in texcoord_0_starts]
-    texcoord_1_values = [
-        STRUCT_VEC2.unpack(buffer_data[i:i + STRUCT_VEC2.size])
-        for i in texcoord_1_starts]
-
-    return indices, pos_values, texcoord_0_values, texcoord_1_values
-
-
-def as_tris(indices, pos_values, texcoord_values):
-    triangles_indices = [
-        (indices[i], indices[i + 1], indices[i + 2])
-        for i in range(0, len(indices), 3)
-    ]
-    pos_tris = []
-    texcoord_tris = []
-    for tri_idx in triangles_indices:
-        i1, i2, i3 = tri_idx
-        pos_tris.append((pos_values[i1], pos_values[i2], pos_values[i3]))
-        texcoord_tris.append(
-            (texcoord_values[i1], texcoord_values[i2], texcoord_values[i3]))
-    return pos_tris, texcoord_tris
-
-
-def fill_mesh_data(buffer, gltf, gltf_mesh, uv0, uv1, b_mesh, mat_mapping,
-                   report):
+    pos_values = read_accessor(
+        gltf, buffer, accessors[attributes['POSITION']]).astype(np.float32)
+    vertex_count = len(pos_values)
+
+    texcoord_values = []
+    for name in ('TEXCOORD_0', 'TEXCOORD_1'):
+        try:
+            accessor_texcoord = accessors[attributes[name]]
+        except KeyError:
+            texcoord_values.append(np.zeros((vertex_count, 2), np.float32))
+            continue
+        texcoord_values.append(read_accessor(
+            gltf, buffer, accessor_texcoord)[:, :2].astype(np.float32))
+
+    try:
+        accessor_indices = accessors[selected['indices']]
+    except KeyError:
+        indices = np.arange(vertex_count, dtype=np.int64)
+    else:
+        indices = read_accessor(
+            gltf, buffer, accessor_indices)[:, 0].astype(np.int64)
+
+    return indices, pos_values, texcoord_values[0], texcoord_values[1]
+
+
+class DecodedMesh(NamedTuple):
+    positions: np.ndarray
+    triangles: np.ndarray
+    uv0: np.ndarray
+    uv1: np.ndarray
+    primitive_materials: List[int]
+    triangle_counts: List[int]
+    normals: Optional[np.ndarray]
+    tangents: Optional[np.ndarray]
+    colors: Optional[np.ndarray]
+    messages: List[str]
+
+
+def concatenate(arrays: list, shape: tuple, dtype=np.float32) -> np.ndarray:
+    if arrays:
+        return np.concatenate(arrays)
+    return np.zeros(shape, dtype)
+
+
+def decode_mesh(buffer, gltf, gltf_mesh) -> DecodedMesh:
+    # does not touch bpy so that it can run in worker threads
+    positions = []
+    triangles = []
+    uvs = ([], [])
+    primitive_materials = []
+    triangle_counts = []
+    messages = []
     idx_offset = 0
-    primitives = gltf_mesh['primitives']
-    idx, pos, tc0, tc1 = read_primitive(gltf, buffer, primitives[0])
 
-    for prim_idx, primitive in enumerate(primitives[0:]):
+    # normals, tangents and colors of all primitives in vertex order
+    shading_attributes = ([], [], [])
+    shading_found = [False, False, False]
+    shading_defaults = (
+        (3, 0.0),  # zero normals fall back to the automatic ones
+        (4, 1.0),
+        (4, 1.0),
+    )
+
+    for primitive in gltf_mesh['primitives']:
         idx, pos, tc0, tc1 = read_primitive(gltf, buffer, primitive)
+        positions.append(to_blender_axes(pos))
+
+        primitive_attributes = read_shading_attributes(
+            gltf, buffer, primitive, len(pos))
+        for i, values in enumerate(primitive_attributes):
+            if values is None:
+                components, default = shading_defaults[i]
+                values = np.full((len(pos), components), default,
+                                 np.float32)
+            else:
+                shading_found[i] = True
+            shading_attributes[i].append(values)
 
-        for p in pos:
-            # converting to blender z up world
-            b_mesh.verts.new((p[0], -p[2], p[1]))
-        b_mesh.verts.ensure_lookup_table()
+        vertex_offset = idx_offset
+        idx_offset += len(pos)
 
         try:
             asobo_data = primitive['extras']['ASOBO_primitive']
         except KeyError:
             # TODO enhance error message
-            report({'ERROR'}, "No Asobo sub primitive")
+            messages.append("No Asobo sub primitive")
             continue
 
-        try:
-            mat_index = mat_mapping[primitive['material']]
-        except KeyError:
-            mat_index = -1
-
         try:
             start_index = asobo_data['StartIndex']
         except KeyError:
@@ -171,79 +437,228 @@ def fill_mesh_data(buffer, gltf, gltf_mesh, uv0, uv1, b_mesh, mat_mapping,
         try:
             start_vertex = asobo_data['BaseVertexIndex']
         except KeyError:
-            start_vertex = idx_offset
+            start_vertex = vertex_offset
 
         tri_count = asobo_data['PrimitiveCount']
-        for tri_i in range(tri_count):
-            i = start_index + tri_i * 3
-            face_indices = (
-                idx[i + 2],
-                idx[i + 1],
-                idx[i + 0],
-            )
-            face = b_mesh.faces.new((
-                b_mesh.verts[start_vertex + face_indices[0]],
-                b_mesh.verts[start_vertex + face_indices[1]],
-                b_mesh.verts[start_vertex + face_indices[2]],
-            ))
-            face.material_index = mat_index
-            for i, loop in enumerate(face.loops):
-                u, v = tc0[face_indices[i]]
-                loop[uv0].uv = (u, 1 - v)
-                u, v = tc1[face_indices[i]]
-                loop[uv1].uv = (u, 1 - v)
-
-        idx_offset += len(pos)
+        face_indices = idx[start_index:start_index + tri_count * 3]
+        if len(face_indices) < tri_count * 3:
+            raise ValueError("primitive exceeds its index accessor")
+        # reversing the winding order
+        face_indices = face_indices.reshape((-1, 3))[:, ::-1]
+        triangles.append(face_indices + start_vertex)
+
+        for uv_list, texcoords in zip(uvs, (tc0, tc1)):
+            face_uvs = texcoords[face_indices].reshape((-1, 2))
+            face_uvs[:, 1] = 1 - face_uvs[:, 1]
+            uv_list.append(face_uvs)
 
+        try:
+            primitive_materials.append(primitive['material'])
+        except KeyError:
+            primitive_materials.append(-1)
+        triangle_counts.append(tri_count)
 
-def create_meshes(buffer, gltf, materials, report):
-    meshes = []
-    for gltf_mesh in gltf['meshes']:
-        bl_mesh = bpy.data.meshes.new(gltf_mesh['name'])
-        meshes.append(bl_mesh)
+    positions = concatenate(positions, (0, 3))
+    triangles = concatenate(triangles, (0, 3), np.int64)
+    if len(triangles) and triangles.max() >= len(positions):
+        raise ValueError("vertex index out of range")
 
-        mat_mapping = {}
-        material_count = 0
-        for primitive in gltf_mesh['primitives']:
-            gltf_mat_index = primitive['material']
-            material = materials[gltf_mat_index]
-            mesh_mat_index = bl_mesh.materials.find(material.name)
-            if mesh_mat_index > -1:
-                mat_mapping[gltf_mat_index] = mesh_mat_index
-            else:
-                mat_mapping[gltf_mat_index] = material_count
-                bl_mesh.materials.append(material)
-                material_count += 1
+    normals, tangents, colors = (
+        np.concatenate(values) if found else None
+        for values, found in zip(shading_attributes, shading_found)
+    )
+    return DecodedMesh(
+        positions, triangles,
+        concatenate(uvs[0], (0, 2)), concatenate(uvs[1], (0, 2)),
+        primitive_materials, triangle_counts,
+        normals, tangents, colors, messages
+    )
 
-        b_mesh = bmesh.new()
-        uv0 = b_mesh.loops.layers.uv.new()
-        uv1 = b_mesh.loops.layers.uv.new()
 
-        try:
-            fill_mesh_data(buffer, gltf, gltf_mesh, uv0, uv1, b_mesh,
-                           mat_mapping,
-                           report)
-        except Exception as e:
-            mesh_name = gltf_mesh['name']
-            report({'ERROR'}, f'could not handle mesh "{mesh_name}'
-                              f'\nException: {type(e)}\nDetails: {e}"')
+def set_point_attribute(bl_mesh, name, data_type, key, values):
+    attribute = bl_mesh.attributes.get(name)
+    if attribute is not None:
+        bl_mesh.attributes.remove(attribute)
+    attribute = bl_mesh.attributes.new(name, data_type, 'POINT')
+    attribute.data.foreach_set(
+        key, np.ascontiguousarray(values, dtype=np.float32).ravel())
+
+
+def apply_shading_attributes(bl_mesh, normals, tangents, colors):
+    if normals is not None:
+        # authored normals replace the automatically calculated ones
+        bl_mesh.polygons.foreach_set(
+            'use_smooth', np.ones(len(bl_mesh.polygons), dtype=bool))
+        bl_mesh.use_auto_smooth = True
+        bl_mesh.normals_split_custom_set_from_vertices(normals)
+
+    if tangents is not None:
+        set_point_attribute(bl_mesh, 'TANGENT', 'FLOAT_VECTOR', 'vector',
+                            tangents[:, :3])
+        set_point_attribute(bl_mesh, 'TANGENT_SIGN', 'FLOAT', 'value',
+                            tangents[:, 3])
+
+    if colors is not None:
+        set_point_attribute(bl_mesh, 'COLOR_0', 'FLOAT_COLOR', 'color',
+                            colors)
+
+
+def hash_and_decode_mesh(buffer, gltf, gltf_mesh, material_names,
+                         source_hash: Optional[str]) -> tuple:
+    # hashing in the worker only reads the buffer range of this mesh
+    if source_hash is None:
+        source_hash = try_mesh_hash(buffer, gltf, gltf_mesh, material_names)
+    return source_hash, decode_mesh(buffer, gltf, gltf_mesh)
+
+
+def assign_mesh_materials(bl_mesh, gltf_mesh, materials) -> dict:
+    mat_mapping = {}
+    material_count = 0
+    for primitive in gltf_mesh['primitives']:
+        gltf_mat_index = primitive.get('material')
+        if gltf_mat_index is None:
+            # faces of primitives without material keep the first slot
             continue
+        material = materials[gltf_mat_index]
+        mesh_mat_index = bl_mesh.materials.find(material.name)
+        if mesh_mat_index > -1:
+            mat_mapping[gltf_mat_index] = mesh_mat_index
+        else:
+            mat_mapping[gltf_mat_index] = material_count
+            bl_mesh.materials.append(material)
+            material_count += 1
+    return mat_mapping
+
+
+def build_mesh(bl_mesh, decoded: DecodedMesh, mat_mapping: dict):
+    vertex_count = len(decoded.positions)
+    tri_count = len(decoded.triangles)
+
+    bl_mesh.clear_geometry()
+    bl_mesh.vertices.add(vertex_count)
+    bl_mesh.vertices.foreach_set('co', decoded.positions.ravel())
+    bl_mesh.loops.add(tri_count * 3)
+    bl_mesh.loops.foreach_set(
+        'vertex_index', decoded.triangles.astype(np.int32).ravel())
+    bl_mesh.polygons.add(tri_count)
+    bl_mesh.polygons.foreach_set(
+        'loop_start', np.arange(0, tri_count * 3, 3, dtype=np.int32))
+    bl_mesh.polygons.foreach_set(
+        'loop_total', np.full(tri_count, 3, dtype=np.int32))
+
+    slot_indices = np.array(
+        [mat_mapping.get(i, 0) for i in decoded.primitive_materials],
+        dtype=np.int32)
+    bl_mesh.polygons.foreach_set(
+        'material_index', np.repeat(slot_indices, decoded.triangle_counts))
+
+    for uvs in (decoded.uv0, decoded.uv1):
+        uv_layer = bl_mesh.uv_layers.new()
+        uv_layer.data.foreach_set('uv', uvs.ravel())
+
+    # drops duplicate and degenerate faces which blender cannot handle
+    bl_mesh.validate()
+    bl_mesh.update(calc_edges=True)
+    apply_shading_attributes(bl_mesh, decoded.normals, decoded.tangents,
+                             decoded.colors)
+
+
+def create_meshes(buffer, gltf, gltf_file, materials, existing: dict,
+                  report, max_pending: Optional[int] = None):
+    meshes = []
+    to_build = []
+    reused_count = 0
+    material_names = [material.name for material in materials]
+    for mesh_index, gltf_mesh in enumerate(gltf['meshes']):
+        identity = gltf_identity(gltf_file, 'mesh', mesh_index,
+                                 gltf_mesh['name'])
+        bl_mesh = existing.get(identity)
+        source_hash = None
+        if bl_mesh is not None:
+            # only reuse candidates are hashed up front, the others while
+            # decoding so the buffer is never read in full at once
+            source_hash = try_mesh_hash(buffer, gltf, gltf_mesh,
+                                        material_names)
+            if source_hash is not None and \
+                    bl_mesh.get(HASH_PROPERTY) == source_hash:
+                meshes.append(bl_mesh)
+                reused_count += 1
+                continue
 
-        b_mesh.to_mesh(bl_mesh)
-        bl_mesh.update()
+        if bl_mesh is None:
+            bl_mesh = bpy.data.meshes.new(gltf_mesh['name'])
+            bl_mesh[ID_PROPERTY] = identity
+        else:
+            bl_mesh.materials.clear()
+        meshes.append(bl_mesh)
+        to_build.append((gltf_mesh, bl_mesh, source_hash))
+
+    # decoding runs concurrently, only the datablock creation needs to
+    # happen on the main thread, limiting the pending decodes bounds the
+    # number of decoded meshes kept in memory
+    max_workers = os.cpu_count() or 1
+    if max_pending is None:
+        max_pending = 2 * max_workers
+    remaining = iter(to_build)
+    pending = collections.deque()
+    with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers) as executor:
+        while True:
+            for gltf_mesh, bl_mesh, source_hash in itertools.islice(
+                    remaining, max_pending - len(pending)):
+                future = executor.submit(hash_and_decode_mesh, buffer, gltf,
+                                         gltf_mesh, material_names,
+                                         source_hash)
+                pending.append((gltf_mesh, bl_mesh, future))
+            if not pending:
+                break
+
+            gltf_mesh, bl_mesh, future = pending.popleft()
+            try:
+                mat_mapping = assign_mesh_materials(bl_mesh, gltf_mesh,
+                                                    materials)
+                source_hash, decoded = future.result()
+                build_mesh(bl_mesh, decoded, mat_mapping)
+            except Exception as e:
+                mesh_name = gltf_mesh['name']
+                report({'ERROR'}, f'could not handle mesh "{mesh_name}'
+                                  f'\nException: {type(e)}\nDetails: {e}"')
+                continue
+            finally:
+                # releasing the decoded arrays before the next mesh
+                del future
+
+            for message in decoded.messages:
+                report({'ERROR'}, message)
+            if source_hash is not None:
+                bl_mesh[HASH_PROPERTY] = source_hash
+            del decoded
+
+    if existing:
+        report({'INFO'}, f"reused {reused_count} of {len(meshes)} meshes")
     return meshes
 
 
-def create_objects(nodes, meshes):
+def create_objects(gltf_file, nodes, meshes, existing: dict,
+                   variant: str = ''):
     objects = []
-    for node in nodes:
+    kind = f'object:{variant}' if variant else 'object'
+    for node_index, node in enumerate(nodes):
         name = node['name']
         try:
             mesh = meshes[node['mesh']]
         except KeyError:
-            mesh = bpy.data.meshes.new(name)
-
-        obj = bpy.data.objects.new(name, mesh)
+            mesh = None
+
+        identity = gltf_identity(gltf_file, kind, node_index, name)
+        obj = existing.get(identity)
+        if obj is None:
+            if mesh is None:
+                mesh = bpy.data.meshes.new(name)
+            obj = bpy.data.objects.new(name, mesh)
+            obj[ID_PROPERTY] = identity
+        elif mesh is not None:
+            obj.data = mesh
 
         try:
             trans = node['translation']
@@ -272,45 +687,199 @@ def create_objects(nodes, meshes):
     return objects
 
 
-def load_gltf_file(gltf_file_name):
+def load_glb_file(glb_file_path: pathlib.Path):
+    with open(glb_file_path, 'rb') as handle:
+        data = memoryview(
+            mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ))
+
+    magic, version, length = STRUCT_GLB_HEADER.unpack_from(data, 0)
+    if magic != GLB_MAGIC or version != 2:
+        raise ValueError(f"unsupported GLB version {version}")
+    if length > len(data):
+        raise ValueError("truncated GLB file")
+
+    gltf = None
+    buffer = None
+    offset = STRUCT_GLB_HEADER.size
+    while offset + STRUCT_GLB_CHUNK_HEADER.size <= length:
+        chunk_length, chunk_type = STRUCT_GLB_CHUNK_HEADER.unpack_from(
+            data, offset)
+        offset += STRUCT_GLB_CHUNK_HEADER.size
+        if offset + chunk_length > length:
+            raise ValueError("truncated GLB chunk")
+        chunk = data[offset:offset + chunk_length]
+        if chunk_type == GLB_CHUNK_JSON and gltf is None:
+            gltf = json.loads(bytes(chunk))
+        elif chunk_type == GLB_CHUNK_BIN and buffer is None:
+            # a view into the mapped file, the data is never copied
+            buffer = chunk
+        offset += chunk_length
+
+    if gltf is None:
+        raise ValueError("GLB file without JSON chunk")
+    return gltf, buffer
+
+
+def load_gltf_file(gltf_file_name, memory_map: bool = False):
     gltf_file_path = pathlib.Path(gltf_file_name)
 
-    with open(gltf_file_path, 'r') as handle:
-        gltf = json.load(handle)
+    with open(gltf_file_path, 'rb') as handle:
+        is_glb = handle.read(len(GLB_MAGIC)) == GLB_MAGIC
+
+    if is_glb:
+        gltf, buffer = load_glb_file(gltf_file_path)
+    else:
+        with open(gltf_file_path, 'r') as handle:
+            gltf = json.load(handle)
+        buffer = None
 
     assert 'buffers' in gltf and len(gltf['buffers']) == 1, "Unable to handle 0 or multiple buffers"
+    if 'uri' not in gltf['buffers'][0]:
+        if buffer is None:
+            raise ValueError(
+                f"{gltf_file_path.name} has neither a BIN chunk nor a buffer "
+                "uri")
+        return gltf, buffer
+
     bin_file_name = gltf_file_path.with_name(gltf['buffers'][0]['uri'])
 
     with open(bin_file_name, 'rb') as handle:
-        buffer = handle.read()
+        if memory_map:
+            # only the pages in use are read and the system can drop them
+            buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            buffer = handle.read()
 
     return gltf, buffer
 
 
-def convert_normal_image(normal_image, report):
-    pixels = np.array(normal_image.pixels[:]).reshape((-1, 4))
+class MemoryUsage(NamedTuple):
+    current: Optional[int]
+    peak: Optional[int]
+    # whether the peak got reset at the start of the following stage
+    peak_reset: bool = False
+
+
+def memory_usage() -> MemoryUsage:
+    if sys.platform == 'win32':
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [
+                ('cb', ctypes.c_ulong),
+                ('PageFaultCount', ctypes.c_ulong),
+                ('PeakWorkingSetSize', ctypes.c_size_t),
+                ('WorkingSetSize', ctypes.c_size_t),
+                ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                ('PagefileUsage', ctypes.c_size_t),
+                ('PeakPagefileUsage', ctypes.c_size_t),
+            ]
+
+        get_current_process = ctypes.windll.kernel32.GetCurrentProcess
+        get_current_process.argtypes = []
+        get_current_process.restype = ctypes.c_void_p
+        get_process_memory_info = ctypes.windll.psapi.GetProcessMemoryInfo
+        get_process_memory_info.argtypes = [
+            ctypes.c_void_p, ctypes.POINTER(ProcessMemoryCounters),
+            ctypes.c_ulong]
+        get_process_memory_info.restype = ctypes.c_int
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        if not get_process_memory_info(get_current_process(),
+                                       ctypes.byref(counters), counters.cb):
+            return MemoryUsage(None, None)
+        return MemoryUsage(counters.WorkingSetSize,
+                           counters.PeakWorkingSetSize)
+
+    try:
+        with open('/proc/self/status', 'r') as handle:
+            fields = dict(line.split(':', 1) for line in handle
+                          if ':' in line)
+        return MemoryUsage(int(fields['VmRSS'].split()[0]) * 1024,
+                           int(fields['VmHWM'].split()[0]) * 1024)
+    except (OSError, KeyError, IndexError, ValueError):
+        pass
+
+    # macOS only offers the peak of the whole process
+    try:
+        import resource
+    except ImportError:
+        return MemoryUsage(None, None)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # reported in bytes on macOS and in kilobytes elsewhere
+    return MemoryUsage(None, peak if sys.platform == 'darwin' else peak * 1024)
+
+
+def reset_peak_memory() -> bool:
+    # only linux allows to reset the peak resident memory of a process
+    try:
+        with open('/proc/self/clear_refs', 'w') as handle:
+            handle.write('5')
+    except OSError:
+        return False
+    return True
+
+
+def track_memory_usage() -> MemoryUsage:
+    peak_reset = reset_peak_memory()
+    return memory_usage()._replace(peak_reset=peak_reset)
+
+
+def format_memory(value: Optional[int], previous: Optional[int]) -> str:
+    if value is None:
+        return "unavailable"
+    if previous is None:
+        return f"{value / 2 ** 20:.0f} MB"
+    return f"{value / 2 ** 20:.0f} MB ({(value - previous) / 2 ** 20:+.0f} MB)"
+
+
+def report_memory_usage(stage: str, previous: MemoryUsage,
+                        report) -> MemoryUsage:
+    usage = memory_usage()
+    if previous.peak_reset:
+        peak = f"peak {format_memory(usage.peak, None)}"
+    else:
+        # without a reset only the increase of the process peak tells the
+        # peak of this stage
+        peak = f"process peak {format_memory(usage.peak, previous.peak)}"
+    current = format_memory(usage.current, previous.current)
+    report({'INFO'}, f"memory usage of {stage}: {peak}, current {current}")
+    return track_memory_usage()
+
+
+def convert_normal_image(normal_image, report, free_buffers: bool = False):
+    pixels = np.empty(len(normal_image.pixels), dtype=np.float32)
+    normal_image.pixels.foreach_get(pixels)
+    pixels = pixels.reshape((-1, 4))
     rgb_pixels = pixels[:, 0:3]
     rgb_pixels[:, 1] = 1.0 - rgb_pixels[:, 1]
     rgb_pixels[:, 2] = np.sqrt(
         1 - (rgb_pixels[:, 0] - 0.5) ** 2 - (rgb_pixels[:, 1] - 0.5) ** 2
     )
-    pixel_data = pixels.reshape((-1, 1)).transpose()[0]
-    normal_image.pixels = pixel_data
+    normal_image.pixels.foreach_set(pixels.ravel())
+    normal_image[NORMAL_CONVERTED_PROPERTY] = True
     try:
         normal_image.save()
     except RuntimeError:
         report(
             {'ERROR'},
             f"could not save converted image {normal_image.name}")
+    else:
+        # the saved file is the converted state an update compares against
+        normal_image[HASH_PROPERTY] = hash_file(
+            pathlib.Path(bpy.path.abspath(normal_image.filepath)))
+        if free_buffers:
+            # loaded again from the saved file once it gets displayed
+            normal_image.buffers_free()
 
 
-def setup_mat_nodes(bl_mat, gltf_mat, textures, images,
-                    converted_normal_images: set, report):
+def material_image_indices(gltf_mat, textures) -> tuple:
     try:
         base_texture = textures[
             gltf_mat['pbrMetallicRoughness']['baseColorTexture']['index']]
-        base_image = images[
-            base_texture['extensions']['MSFT_texture_dds']['source']]
+        base_image = base_texture['extensions']['MSFT_texture_dds']['source']
     except (KeyError, IndexError):
         base_image = None
 
@@ -318,87 +887,230 @@ def setup_mat_nodes(bl_mat, gltf_mat, textures, images,
         metallic_roughness_texture = textures[
             gltf_mat['pbrMetallicRoughness']['metallicRoughnessTexture'][
                 'index']]
-        met_rough_image = images[
-            metallic_roughness_texture['extensions']['MSFT_texture_dds'][
-                'source']]
+        met_rough_image = metallic_roughness_texture['extensions'][
+            'MSFT_texture_dds']['source']
     except (KeyError, IndexError):
         met_rough_image = None
 
     try:
         normal_texture = textures[gltf_mat['normalTexture']['index']]
-        normal_image = images[
-            normal_texture['extensions']['MSFT_texture_dds']['source']]
+        normal_image = normal_texture['extensions']['MSFT_texture_dds'][
+            'source']
     except (KeyError, IndexError):
         normal_image = None
 
+    return base_image, met_rough_image, normal_image
+
+
+def material_images(gltf_mat, textures, images) -> tuple:
+    bl_images = []
+    for image_index in material_image_indices(gltf_mat, textures):
+        try:
+            bl_images.append(images[image_index])
+        except (TypeError, IndexError):
+            bl_images.append(None)
+    return tuple(bl_images)
+
+
+def image_roles(gltf) -> dict:
+    roles = {}
+    for gltf_mat in gltf['materials']:
+        image_indices = material_image_indices(gltf_mat, gltf['textures'])
+        for image_index, role in zip(
+                image_indices,
+                (ALBEDO_ROLE, METALLIC_ROUGHNESS_ROLE, NORMAL_ROLE)):
+            if image_index is not None:
+                roles.setdefault(image_index, role)
+    return roles
+
+
+def material_hash(gltf_mat, bl_images) -> str:
+    image_names = [image.name if image else '' for image in bl_images]
+    return hash_data(
+        json.dumps(gltf_mat, sort_keys=True).encode(),
+        json.dumps(image_names).encode(),
+        str(MATERIAL_TEMPLATE_VERSION).encode()
+    )
+
+
+def create_msfs_pbr_node_group():
+    node_group = bpy.data.node_groups.new(MSFS_PBR_NODE_GROUP,
+                                          'ShaderNodeTree')
+    node_group[TEMPLATE_PROPERTY] = MATERIAL_TEMPLATE_VERSION
+
+    # unbound inputs default to the values of an untextured material
+    socket = node_group.inputs.new('NodeSocketColor', 'Base Color')
+    socket.default_value = (0.8, 0.8, 0.8, 1.0)
+    socket = node_group.inputs.new('NodeSocketFloatFactor', 'Alpha')
+    socket.default_value = 1.0
+    socket.min_value = 0.0
+    socket.max_value = 1.0
+    socket = node_group.inputs.new('NodeSocketColor', 'Metallic Roughness')
+    socket.default_value = (0.0, 0.5, 0.0, 1.0)
+    socket = node_group.inputs.new('NodeSocketColor', 'Normal Map')
+    socket.default_value = (0.5, 0.5, 1.0, 1.0)
+    node_group.outputs.new('NodeSocketShader', 'BSDF')
+
+    nodes = node_group.nodes
+    links = node_group.links
+    input_node = nodes.new('NodeGroupInput')
+    input_node.location = (-500, 0)
+    output_node = nodes.new('NodeGroupOutput')
+    output_node.location = (300, 0)
+    p_bsdf_node = nodes.new('ShaderNodeBsdfPrincipled')
+    p_bsdf_node.location = (0, 0)
+
+    separate_node = nodes.new('ShaderNodeSeparateRGB')
+    separate_node.location = (-250, 0)
+    normal_map_node = nodes.new('ShaderNodeNormalMap')
+    normal_map_node.location = (-250, -300)
+
+    links.new(p_bsdf_node.inputs['Base Color'],
+              input_node.outputs['Base Color'])
+    links.new(p_bsdf_node.inputs['Alpha'], input_node.outputs['Alpha'])
+    links.new(separate_node.inputs['Image'],
+              input_node.outputs['Metallic Roughness'])
+    links.new(p_bsdf_node.inputs['Metallic'], separate_node.outputs['B'])
+    links.new(p_bsdf_node.inputs['Roughness'], separate_node.outputs['G'])
+    links.new(normal_map_node.inputs['Color'],
+              input_node.outputs['Normal Map'])
+    links.new(p_bsdf_node.inputs['Normal'],
+              normal_map_node.outputs['Normal'])
+    links.new(output_node.inputs['BSDF'], p_bsdf_node.outputs['BSDF'])
+    return node_group
+
+
+def get_msfs_pbr_node_group():
+    for node_group in bpy.data.node_groups:
+        if node_group.get(TEMPLATE_PROPERTY) == MATERIAL_TEMPLATE_VERSION:
+            return node_group
+    return create_msfs_pbr_node_group()
+
+
+def bind_image(tree, group_node, image, location, socket_names,
+               non_color: bool):
+    image_node = tree.nodes.new('ShaderNodeTexImage')
+    image_node.location = location
+    image_node.image = image
+    if non_color:
+        image.colorspace_settings.name = 'Non-Color'
+    for output_name, input_name in socket_names:
+        tree.links.new(group_node.inputs[input_name],
+                       image_node.outputs[output_name])
+
+
+def setup_mat_nodes(bl_mat, node_group, base_image, met_rough_image,
+                    normal_image):
     bl_mat.use_nodes = True
     tree = bl_mat.node_tree
-    p_bsdf_node = tree.nodes['Principled BSDF']
+    # also drops nodes of a previous import when rebuilding in place
+    tree.nodes.clear()
+
+    output_node = tree.nodes.new('ShaderNodeOutputMaterial')
+    output_node.location = (300, 0)
+    group_node = tree.nodes.new('ShaderNodeGroup')
+    group_node.node_tree = node_group
+    group_node.location = (0, 0)
+    tree.links.new(output_node.inputs['Surface'],
+                   group_node.outputs['BSDF'])
 
     if base_image:
-        base_image_node = tree.nodes.new('ShaderNodeTexImage')
-        base_image_node.location = (-500, 400)
-        base_image_node.image = base_image
-        tree.links.new(p_bsdf_node.inputs['Base Color'],
-                       base_image_node.outputs['Color'])
-        tree.links.new(p_bsdf_node.inputs['Alpha'],
-                       base_image_node.outputs['Alpha'])
+        bind_image(tree, group_node, base_image, (-400, 400),
+                   (('Color', 'Base Color'), ('Alpha', 'Alpha')), False)
 
     if met_rough_image:
-        met_rough_image_node = tree.nodes.new('ShaderNodeTexImage')
-        met_rough_image_node.location = (-500, 0)
-        met_rough_image_node.image = met_rough_image
-        met_rough_image_node.image.colorspace_settings.name = 'Non-Color'
+        bind_image(tree, group_node, met_rough_image, (-400, 0),
+                   (('Color', 'Metallic Roughness'),), True)
 
-        separate_node = tree.nodes.new('ShaderNodeSeparateRGB')
-        separate_node.location = (-200, 0)
+    if normal_image:
+        bind_image(tree, group_node, normal_image, (-400, -400),
+                   (('Color', 'Normal Map'),), True)
 
-        tree.links.new(separate_node.inputs['Image'],
-                       met_rough_image_node.outputs['Color'])
-        tree.links.new(p_bsdf_node.inputs['Metallic'],
-                       separate_node.outputs['B'])
-        tree.links.new(p_bsdf_node.inputs['Roughness'],
-                       separate_node.outputs['G'])
 
-    if normal_image:
-        normal_image_name = pathlib.Path(normal_image.filepath).name
-        if normal_image_name not in converted_normal_images:
-            report({'INFO'}, f"converting_normal_image {normal_image}")
-            convert_normal_image(normal_image, report)
-            converted_normal_images.add(normal_image_name)
-        normal_image_node = tree.nodes.new('ShaderNodeTexImage')
-        normal_image_node.location = (-500, -400)
-        normal_image_node.image = normal_image
-        normal_image_node.image.colorspace_settings.name = 'Non-Color'
-
-        normal_map_node = tree.nodes.new('ShaderNodeNormalMap')
-        normal_map_node.location = (-200, -400)
-
-        tree.links.new(normal_map_node.inputs['Color'],
-                       normal_image_node.outputs['Color'])
-        tree.links.new(p_bsdf_node.inputs['Normal'],
-                       normal_map_node.outputs['Normal'])
-
-
-def create_materials(gltf, images, report, converted_normal_images: set):
+def create_materials(gltf, gltf_file, images, existing: dict, report,
+                     converted_normal_images: set, variant: str = '',
+                     free_buffers: bool = False):
     report({'INFO'}, 'creating materials')
     materials = []
+    reused_count = 0
     textures = gltf['textures']
-    for gltf_mat in gltf['materials']:
+    node_group = get_msfs_pbr_node_group()
+    kind = f'material:{variant}' if variant else 'material'
+    for mat_index, gltf_mat in enumerate(gltf['materials']):
+        bl_images = material_images(gltf_mat, textures, images)
+        normal_image = bl_images[2]
+        # also required for reused materials since their image may have
+        # been reloaded from an unconverted file
+        if normal_image:
+            normal_image_path = str(pathlib.Path(
+                bpy.path.abspath(normal_image.filepath)).resolve())
+            # kept unsaved images hold already converted pixels
+            if normal_image_path not in converted_normal_images and \
+                    not normal_image.get(NORMAL_CONVERTED_PROPERTY):
+                report({'INFO'}, f"converting_normal_image {normal_image}")
+                convert_normal_image(normal_image, report, free_buffers)
+            converted_normal_images.add(normal_image_path)
+
+        name = gltf_mat['name']
+        identity = gltf_identity(gltf_file, kind, mat_index, name)
+        if variant:
+            name = f'{name} [{variant}]'
+        source_hash = material_hash(gltf_mat, bl_images)
+        bl_mat = existing.get(identity)
+        if bl_mat is not None and bl_mat.get(HASH_PROPERTY) == source_hash:
+            materials.append(bl_mat)
+            reused_count += 1
+            continue
+
         blend_method = BLEND_METHOD_CONVERSION.get(
             gltf_mat.get('alphaMode', 'OPAQUE'),
             'OPAQUE'
         )
 
-        name = gltf_mat['name']
-        bl_mat = bpy.data.materials.new(name)
+        if bl_mat is None:
+            bl_mat = bpy.data.materials.new(name)
+            bl_mat[ID_PROPERTY] = identity
         bl_mat.blend_method = blend_method
-        setup_mat_nodes(bl_mat, gltf_mat, textures, images,
-                        converted_normal_images, report)
+        setup_mat_nodes(bl_mat, node_group, *bl_images)
+        bl_mat[HASH_PROPERTY] = source_hash
         materials.append(bl_mat)
+
+    if existing:
+        report({'INFO'},
+               f"reused {reused_count} of {len(materials)} materials")
     return materials
 
 
+def assign_livery_materials(bl_objects, base_materials, livery_materials):
+    livery_by_base = {
+        base.name: livery
+        for base, livery in zip(base_materials, livery_materials)
+    }
+    # the mesh data is shared with the base objects, only the object level
+    # material slots point to the livery
+    for bl_object in bl_objects:
+        for slot in bl_object.material_slots:
+            base = slot.material
+            if base is not None:
+                slot.link = 'OBJECT'
+                slot.material = livery_by_base.get(base.name, base)
+
+
+def livery_collection(parent, name: str, reuse: bool):
+    collection = bpy.data.collections.get(name) if reuse else None
+    if collection is None:
+        collection = bpy.data.collections.new(name)
+    if collection.name not in parent.children:
+        parent.children.link(collection)
+    return collection
+
+
+def link_object(collection, bl_object):
+    # objects kept from a previous import stay where the user put them
+    if not bl_object.users_collection:
+        collection.objects.link(bl_object)
+
+
 def setup_object_hierarchy(bl_objects, gltf, collection):
     scene_description = gltf['scenes'][0]
     gltf_nodes = gltf['nodes']
@@ -413,45 +1125,73 @@ def setup_object_hierarchy(bl_objects, gltf, collection):
             gltf_child_node = gltf_nodes[j]
             bl_child_object = bl_objects[j]
             bl_child_object.parent = bl_parent_object
-            collection.objects.link(bl_child_object)
+            link_object(collection, bl_child_object)
             add_children(bl_child_object, gltf_child_node)
 
     for i in scene_description['nodes']:
         gltf_node = gltf_nodes[i]
         bl_object = bl_objects[i]
-        collection.objects.link(bl_object)
+        link_object(collection, bl_object)
         add_children(bl_object, gltf_node)
 
 
 def import_images(gltf, converted_textures_dir: pathlib.Path, report) -> list:
+    search_dirs = [converted_textures_dir]
+    # textures shared by several liveries are converted into the parent
+    if (converted_textures_dir.parent / NORMAL_IMAGES_LIST_JSON).exists():
+        search_dirs.append(converted_textures_dir.parent)
+
     image_list = []
     for i, image in enumerate(gltf['images']):
-        dds_file = converted_textures_dir / image['uri']
-        png_file = dds_file.with_suffix('.PNG')
-        if png_file.exists():
-            image_list.append(png_file)
+        try:
+            image_uri = image['uri']
+        except KeyError:
+            report({'ERROR'}, f"invalid image at {i}")
+            image_list.append(None)
+            continue
+
+        for search_dir in search_dirs:
+            dds_file = search_dir / image_uri
+            png_file = dds_file.with_suffix('.PNG')
+            if png_file.exists():
+                image_list.append(png_file)
+                break
         else:
             report({'ERROR'}, f"Cannot import image {png_file}")
+            image_list.append(None)
     return image_list
 
 
-def convert_images(gltf, original_textures_dir, texconv_path: pathlib.Path,
-                   fs_base_path: Optional[pathlib.Path],
-                   converted_textures_dir: pathlib.Path, report) -> list:
-    to_convert_images = []
-    converted_images = []
-    final_image_paths = []
+def livery_names(livery_dirs) -> list:
+    names = [
+        f'{livery_dir.parent.name}_{livery_dir.name}'
+        for livery_dir in livery_dirs
+    ]
+    # liveries of different packages can share their folder names
+    name_counts = collections.Counter(names)
+    return [
+        f'{name}_{i}' if name_counts[name] > 1 else name
+        for i, name in enumerate(names)
+    ]
+
+
+def resolve_image_files(gltf, original_textures_dir: pathlib.Path,
+                        fs_base_path: Optional[pathlib.Path],
+                        report) -> list:
+    image_files = []
+    texture_fallbacks = None
     for i, image in enumerate(gltf['images']):
         try:
             dds_file = original_textures_dir / image['uri']
         except KeyError:
             report({'ERROR'}, f"invalid image at {i}")
-            final_image_paths.append(None)
+            image_files.append(None)
             continue
 
         if not dds_file.exists():
-            texture_fallbacks = collect_fallbacks_of(original_textures_dir,
-                                                     fs_base_path, report)
+            if texture_fallbacks is None:
+                texture_fallbacks = collect_fallbacks_of(
+                    original_textures_dir, fs_base_path, report)
             for fallback_dir in texture_fallbacks:
                 dds_file = fallback_dir / image['uri']
                 if dds_file.exists():
@@ -459,53 +1199,95 @@ def convert_images(gltf, original_textures_dir, texconv_path: pathlib.Path,
             else:
                 report({'ERROR'},
                        f"invalid image file location at {i}: {dds_file}")
-                final_image_paths.append(None)
+                image_files.append(None)
                 continue
 
-        final_image_paths.append('')
-        to_convert_images.append(str(dds_file))
+        image_files.append(dds_file)
+    return image_files
+
 
-    converted_textures_dir.mkdir(parents=True, exist_ok=True)
-    output_dir_param = str(converted_textures_dir)
-    report({'INFO'}, "converting images with texconv")
+def run_texconv(texconv_path: pathlib.Path, dds_files: list,
+                output_dir: pathlib.Path, report) -> list:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    report({'INFO'}, f"converting images with texconv into {output_dir}")
     try:
         output_lines = subprocess.run(
             [
                 str(texconv_path),
                 '-y',
-                '-o', output_dir_param,
+                '-o', str(output_dir),
                 '-f', 'rgba',
                 '-ft', 'png',
-                *to_convert_images
+                *[str(dds_file) for dds_file in dds_files]
             ],
             check=True,
             capture_output=True
         ).stdout.decode('cp1252').split('\r\n')
     except subprocess.CalledProcessError as e:
         report({'ERROR'}, f"could not convert image textures {e}")
-        return final_image_paths
-    else:
-        for line in output_lines:
-            line: str
-            if line.startswith('writing'):
-                png_file = line[len('writing '):]
-                path = pathlib.Path(png_file)
-                if path.exists():
-                    converted_images.append(path)
-                else:
-                    converted_images.append(None)
+        return [None] * len(dds_files)
 
-        conv_i = 0
-        for i, image in enumerate(final_image_paths):
-            if image is None:
+    converted_images = []
+    for line in output_lines:
+        line: str
+        if line.startswith('writing'):
+            png_file = line[len('writing '):]
+            path = pathlib.Path(png_file)
+            if path.exists():
+                converted_images.append(path)
+            else:
+                converted_images.append(None)
+
+    converted_images.extend([None] * (len(dds_files) - len(converted_images)))
+    return converted_images[:len(dds_files)]
+
+
+def convert_images(gltf, original_textures_dirs: List[pathlib.Path],
+                   texconv_path: pathlib.Path,
+                   fs_base_path: Optional[pathlib.Path],
+                   converted_textures_dir: pathlib.Path, report) -> list:
+    livery_image_files = [
+        resolve_image_files(gltf, original_textures_dir, fs_base_path, report)
+        for original_textures_dir in original_textures_dirs
+    ]
+
+    # every unique dds file is converted exactly once, fallbacks shared by
+    # several liveries end up in the common directory and the overrides of
+    # each livery in its own sub directory
+    output_dirs = {}
+    shared_files = {}
+    for livery_dir, variant, image_files in zip(
+            original_textures_dirs, livery_names(original_textures_dirs),
+            livery_image_files):
+        livery_output_dir = converted_textures_dir / variant
+        for dds_file in image_files:
+            if dds_file is None or dds_file in output_dirs:
                 continue
-            try:
-                final_image_paths[i] = converted_images[conv_i]
-            except IndexError:
-                final_image_paths[i] = None
+            if len(original_textures_dirs) == 1:
+                output_dirs[dds_file] = converted_textures_dir
+            elif dds_file.parent == livery_dir:
+                output_dirs[dds_file] = livery_output_dir
+            elif shared_files.setdefault(dds_file.name, dds_file) == dds_file:
+                output_dirs[dds_file] = converted_textures_dir
             else:
-                conv_i += 1
-        return final_image_paths
+                # a different fallback with the same name is already shared
+                output_dirs[dds_file] = livery_output_dir
+
+    files_by_output_dir = {}
+    for dds_file, output_dir in output_dirs.items():
+        files_by_output_dir.setdefault(output_dir, []).append(dds_file)
+
+    converted_images = {}
+    for output_dir, dds_files in files_by_output_dir.items():
+        converted_images.update(zip(
+            dds_files, run_texconv(texconv_path, dds_files, output_dir, report)
+        ))
+
+    livery_images = [
+        [converted_images.get(dds_file) for dds_file in image_files]
+        for image_files in livery_image_files
+    ]
+    return livery_image_files, livery_images
 
 
 def collect_fallbacks_of(
@@ -563,11 +1345,25 @@ def collect_fallbacks_of(
     return fallbacks
 
 
-def load_images(images, report) -> list:
+def load_images(images, check_existing: bool, report) -> list:
     bl_images = []
     for image in images:
         if image:
-            bl_image = bpy.data.images.load(filepath=str(image))
+            bl_image = bpy.data.images.load(filepath=str(image),
+                                            check_existing=check_existing)
+            image_hash = hash_file(image)
+            if bl_image.get(HASH_PROPERTY) != image_hash:
+                if bl_image.is_dirty:
+                    # never discard unsaved texture painting
+                    report({'WARNING'},
+                           f"keeping unsaved changes of image "
+                           f"{bl_image.name} instead of reloading {image}")
+                else:
+                    if bl_image.has_data:
+                        bl_image.reload()
+                    bl_image[HASH_PROPERTY] = image_hash
+                    if NORMAL_CONVERTED_PROPERTY in bl_image:
+                        del bl_image[NORMAL_CONVERTED_PROPERTY]
             bl_image.use_fake_user = True
         else:
             bl_image = None
@@ -587,48 +1383,307 @@ def load_converted_normal_list(json_file: pathlib.Path) -> list:
     return normal_images
 
 
+def load_converted_normal_paths(textures_dirs) -> set:
+    normal_paths = set()
+    for textures_dir in textures_dirs:
+        try:
+            normal_images = load_converted_normal_list(
+                textures_dir / NORMAL_IMAGES_LIST_JSON)
+        except FileNotFoundError:
+            continue
+        normal_paths.update(
+            str((textures_dir / name).resolve()) for name in normal_images)
+    return normal_paths
+
+
+def save_converted_normal_paths(normal_paths: set, textures_dirs):
+    for textures_dir in textures_dirs:
+        resolved_dir = textures_dir.resolve()
+        save_converted_normal_list(
+            [
+                pathlib.Path(path).name for path in normal_paths
+                if pathlib.Path(path).parent == resolved_dir
+            ],
+            textures_dir / NORMAL_IMAGES_LIST_JSON
+        )
+
+
+def load_conversion_manifest(textures_dir: pathlib.Path) -> dict:
+    with open(str(textures_dir / CONVERSION_MANIFEST_JSON), 'r') as handle:
+        return json.load(handle)
+
+
+def save_conversion_manifest(manifest: dict, textures_dir: pathlib.Path):
+    with open(str(textures_dir / CONVERSION_MANIFEST_JSON), 'w') as handle:
+        json.dump(manifest, handle, indent=2)
+
+
+def update_conversion_manifests(gltf, original_textures_dirs, livery_sources,
+                                livery_images):
+    roles = image_roles(gltf)
+    manifests = {}
+    for livery_dir, image_files, images in zip(
+            original_textures_dirs, livery_sources, livery_images):
+        for image_index, (dds_file, png_file) in enumerate(
+                zip(image_files, images)):
+            if not png_file:
+                continue
+            entries = manifests.setdefault(png_file.parent, {})
+            if png_file.name in entries:
+                # a fallback shared by several liveries is exported into each
+                liveries = entries[png_file.name]['liveries']
+                if str(livery_dir) not in liveries:
+                    liveries.append(str(livery_dir))
+                continue
+            # the hash of the imported state tells which textures got painted
+            entries[png_file.name] = {
+                'source': str(dds_file),
+                'role': roles.get(image_index, ALBEDO_ROLE),
+                'liveries': [str(livery_dir)],
+                'hash': hash_file(png_file),
+            }
+
+    for textures_dir, entries in manifests.items():
+        try:
+            manifest = load_conversion_manifest(textures_dir)
+        except FileNotFoundError:
+            manifest = {}
+        manifest.update(entries)
+        save_conversion_manifest(manifest, textures_dir)
+
+
+def read_dds_format(dds_file: pathlib.Path) -> Optional[str]:
+    try:
+        with open(dds_file, 'rb') as handle:
+            header = handle.read(132)
+    except OSError:
+        return None
+    if len(header) < 128 or header[:4] != b'DDS ':
+        return None
+
+    four_cc = header[84:88]
+    if four_cc == b'DX10' and len(header) == 132:
+        dxgi_format, = struct.unpack_from('<I', header, 128)
+        return DXGI_FORMAT_NAMES.get(dxgi_format)
+    return FOURCC_FORMAT_NAMES.get(four_cc)
+
+
+def save_msfs_normal_image(png_file: pathlib.Path,
+                           output_file: pathlib.Path):
+    bl_image = bpy.data.images.load(str(png_file), check_existing=False)
+    try:
+        bl_image.colorspace_settings.name = 'Non-Color'
+        pixels = np.empty(len(bl_image.pixels), dtype=np.float32)
+        bl_image.pixels.foreach_get(pixels)
+        pixels = pixels.reshape((-1, 4))
+        # reverting convert_normal_image, the reconstructed blue channel is
+        # not part of the two channel msfs normal maps
+        pixels[:, 1] = 1.0 - pixels[:, 1]
+        pixels[:, 2] = 0.0
+        bl_image.pixels.foreach_set(pixels.ravel())
+        bl_image.filepath_raw = str(output_file)
+        bl_image.file_format = 'PNG'
+        bl_image.save()
+    finally:
+        bpy.data.images.remove(bl_image)
+
+
+def convert_to_dds(texconv_path: pathlib.Path, png_file: pathlib.Path,
+                   dds_format: str, output_dir: pathlib.Path):
+    # runs in a worker thread, each conversion is its own texconv process
+    arguments = [
+        str(texconv_path),
+        '-y',
+        '-o', str(output_dir),
+        '-f', dds_format,
+    ]
+    if dds_format.endswith('_SRGB'):
+        arguments.append('-srgb')
+    subprocess.run([*arguments, str(png_file)], check=True,
+                   capture_output=True)
+
+
+def conversion_manifest_dirs(textures_dir: pathlib.Path) -> list:
+    # livery overrides of a batch conversion have their own manifest in a
+    # subdirectory of the output directory
+    candidates = [textures_dir, *sorted(textures_dir.iterdir())]
+    return [path for path in candidates
+            if (path / CONVERSION_MANIFEST_JSON).is_file()]
+
+
+def export_textures(textures_dir: pathlib.Path, texconv_path: pathlib.Path,
+                    export_all: bool, report):
+    manifests = {manifest_dir: load_conversion_manifest(manifest_dir)
+                 for manifest_dir in conversion_manifest_dirs(textures_dir)}
+    if not manifests:
+        report({'ERROR'}, f"no conversion manifest found in {textures_dir}")
+        return
+
+    # textures painted in this session need to be on disk first
+    resolved_manifests = {manifest_dir.resolve(): manifest
+                          for manifest_dir, manifest in manifests.items()}
+    for bl_image in bpy.data.images:
+        if not bl_image.is_dirty:
+            continue
+        image_path = pathlib.Path(bpy.path.abspath(bl_image.filepath))
+        manifest = resolved_manifests.get(image_path.resolve().parent)
+        if manifest is not None and image_path.name in manifest:
+            bl_image.save()
+
+    to_export = []
+    for manifest_dir, manifest in manifests.items():
+        for png_name, entry in manifest.items():
+            png_file = manifest_dir / png_name
+            if not png_file.exists():
+                report({'ERROR'}, f"cannot export missing image {png_file}")
+                continue
+            png_hash = hash_file(png_file)
+            if export_all or png_hash != entry['hash']:
+                to_export.append((png_file, entry, png_hash))
+
+    if not to_export:
+        report({'INFO'}, "no modified textures to export")
+        return
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        jobs = []
+        for png_file, entry, png_hash in to_export:
+            role = entry['role']
+            dds_format = read_dds_format(pathlib.Path(entry['source'])) or \
+                DEFAULT_DDS_FORMATS[role]
+            if role == NORMAL_ROLE:
+                # keeping the name since texconv derives the output from it
+                source_file = pathlib.Path(work_dir) / png_file.name
+                save_msfs_normal_image(png_file, source_file)
+            else:
+                source_file = png_file
+            jobs.append((png_file, entry, png_hash, source_file, dds_format))
+
+        report({'INFO'}, f"exporting {len(jobs)} textures with texconv")
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=os.cpu_count()) as executor:
+            job_futures = [
+                [
+                    executor.submit(convert_to_dds, texconv_path,
+                                    source_file, dds_format,
+                                    pathlib.Path(livery_dir))
+                    for livery_dir in entry['liveries']
+                ]
+                for _, entry, _, source_file, dds_format in jobs
+            ]
+            for (png_file, entry, png_hash, _, _), futures in zip(
+                    jobs, job_futures):
+                exported = True
+                for livery_dir, future in zip(entry['liveries'], futures):
+                    try:
+                        future.result()
+                    except subprocess.CalledProcessError as e:
+                        report({'ERROR'},
+                               f"could not export {png_file} into "
+                               f"{livery_dir} {e}")
+                        exported = False
+                if exported:
+                    entry['hash'] = png_hash
+
+    for manifest_dir, manifest in manifests.items():
+        save_conversion_manifest(manifest, manifest_dir)
+
+
 def import_msfs_gltf(context, gltf_file: pathlib.Path, report: Callable,
                      convert_textures: bool, import_textures: bool,
                      texconv_path: Optional[pathlib.Path],
                      fs_base_path: Optional[pathlib.Path],
                      converted_textures_dir: Optional[pathlib.Path],
-                     original_textures_dirs: List[pathlib.Path]):
-    gltf, buffer = load_gltf_file(gltf_file)
+                     original_textures_dirs: List[pathlib.Path],
+                     update_existing: bool = False, streaming: bool = False):
+    stage_memory = track_memory_usage() if streaming else None
+    gltf, buffer = load_gltf_file(gltf_file, memory_map=streaming)
+    if streaming:
+        stage_memory = report_memory_usage("loading the glTF file",
+                                           stage_memory, report)
+
+    if update_existing:
+        existing_materials = index_existing(bpy.data.materials)
+        existing_meshes = index_existing(bpy.data.meshes)
+        existing_objects = index_existing(bpy.data.objects)
+    else:
+        existing_materials = {}
+        existing_meshes = {}
+        existing_objects = {}
 
     if convert_textures:
-        # TODO refactor multiple dir usage
-        images = convert_images(gltf, original_textures_dirs[0], texconv_path,
-                                fs_base_path, converted_textures_dir, report)
+        livery_sources, livery_images = convert_images(
+            gltf, original_textures_dirs, texconv_path, fs_base_path,
+            converted_textures_dir, report)
         converted_normal_images = set()
 
     elif import_textures:
-        images = import_images(
-            gltf, converted_textures_dir, report)
-        try:
-            converted_normal_images = set(load_converted_normal_list(
-                converted_textures_dir / NORMAL_IMAGES_LIST_JSON
-            ))
-        except FileNotFoundError:
-            converted_normal_images = set()
+        livery_images = [import_images(
+            gltf, converted_textures_dir, report)]
+        converted_normal_images = load_converted_normal_paths(
+            (converted_textures_dir, converted_textures_dir.parent))
 
     else:
-        images = []
+        livery_images = [[]]
         converted_normal_images = set()
 
-    bl_images = load_images(images, report)
-    materials = create_materials(gltf, bl_images, report,
-                                 converted_normal_images)
+    # images shared between liveries are loaded only once
+    unique_images = list(dict.fromkeys(
+        image for images in livery_images for image in images if image))
+    bl_image_by_path = dict(zip(
+        unique_images, load_images(unique_images, update_existing, report)))
+
+    variants = livery_names(original_textures_dirs)
+    livery_materials = []
+    for livery_index, images in enumerate(livery_images):
+        variant = variants[livery_index] if livery_index else ''
+        bl_images = [bl_image_by_path.get(image) for image in images]
+        livery_materials.append(create_materials(
+            gltf, gltf_file, bl_images, existing_materials, report,
+            converted_normal_images, variant, free_buffers=streaming))
+    materials = livery_materials[0]
 
     if convert_textures:
-        save_converted_normal_list(
-            list(converted_normal_images),
-            converted_textures_dir / NORMAL_IMAGES_LIST_JSON
+        save_converted_normal_paths(
+            converted_normal_images,
+            {image.parent for image in unique_images}
         )
-
-    meshes = create_meshes(buffer, gltf, materials, report)
-    objects = create_objects(gltf['nodes'], meshes)
+        update_conversion_manifests(gltf, original_textures_dirs,
+                                    livery_sources, livery_images)
+
+    if streaming:
+        # pixels are loaded again from disk once they get displayed, unsaved
+        # painting only exists in the buffers and has to be kept
+        for bl_image in bl_image_by_path.values():
+            if bl_image and not bl_image.is_dirty:
+                bl_image.buffers_free()
+        stage_memory = report_memory_usage("creating materials",
+                                           stage_memory, report)
+
+    meshes = create_meshes(buffer, gltf, gltf_file, materials,
+                           existing_meshes, report,
+                           max_pending=1 if streaming else None)
+    if streaming:
+        stage_memory = report_memory_usage("creating meshes", stage_memory,
+                                           report)
+
+    objects = create_objects(gltf_file, gltf['nodes'], meshes,
+                             existing_objects)
     setup_object_hierarchy(objects, gltf, context.collection)
 
+    # further liveries get their own objects sharing the same mesh data
+    for variant, variant_materials in zip(variants[1:],
+                                          livery_materials[1:]):
+        collection = livery_collection(context.collection, variant,
+                                       update_existing)
+        livery_objects = create_objects(gltf_file, gltf['nodes'], meshes,
+                                        existing_objects, variant)
+        assign_livery_materials(livery_objects, materials, variant_materials)
+        setup_object_hierarchy(livery_objects, gltf, collection)
+
+    if streaming:
+        report_memory_usage("creating objects", stage_memory, report)
+
 
 def path_good(path: pathlib.Path) -> bool:
     return path.name == 'texconv.exe' and path.exists()
@@ -642,6 +1697,8 @@ class ImportProperties:
     import_textures: bool
     convert_textures_dirs: List[pathlib.Path]
     import_textures_dir: Optional[pathlib.Path]
+    update_existing: bool
+    streaming: bool
 
     @classmethod
     def reset(cls):
@@ -652,6 +1709,8 @@ class ImportProperties:
         cls.import_textures = False
         cls.convert_textures_dirs = []
         cls.import_textures_dir = None
+        cls.update_existing = False
+        cls.streaming = False
 
 
 class MsfsTexturesImporter(Operator, ImportHelper):
@@ -676,7 +1735,9 @@ class MsfsTexturesImporter(Operator, ImportHelper):
                          ImportProperties.texconv_path,
                          ImportProperties.fs_base_path,
                          ImportProperties.import_textures_dir,
-                         ImportProperties.convert_textures_dirs)
+                         ImportProperties.convert_textures_dirs,
+                         ImportProperties.update_existing,
+                         ImportProperties.streaming)
 
         return {'FINISHED'}
 
@@ -691,13 +1752,63 @@ class MsfsTexturesConverter(Operator, ImportHelper):
         maxlen=255,
     )
 
+    add_livery: BoolProperty(
+        name="Add Another Livery",
+        description="Select the texture.cfg of another livery afterwards. "
+                    "Fallback textures shared by the liveries are only "
+                    "converted once",
+        default=False,
+        options={'SKIP_SAVE'},
+    )
+
     def execute(self, context):
         ImportProperties.convert_textures = True
         textures_dir = pathlib.Path(self.filepath)
         if not textures_dir.is_dir():
             textures_dir = textures_dir.parent
-        ImportProperties.convert_textures_dirs = [textures_dir.absolute()]
-        bpy.ops.msfs_gltf.textures_importer('INVOKE_DEFAULT')
+        textures_dir = textures_dir.absolute()
+        if textures_dir not in ImportProperties.convert_textures_dirs:
+            ImportProperties.convert_textures_dirs.append(textures_dir)
+        if self.add_livery:
+            bpy.ops.msfs_gltf.textures_converter('INVOKE_DEFAULT')
+        else:
+            bpy.ops.msfs_gltf.textures_importer('INVOKE_DEFAULT')
+
+        return {'FINISHED'}
+
+
+class MsfsTexturesExporter(Operator, ImportHelper):
+    bl_idname = "msfs_gltf.textures_exporter"
+    bl_label = "Export Painted Textures"
+
+    filter_glob: StringProperty(
+        default="*.png",
+        options={'HIDDEN'},
+        maxlen=255,
+    )
+
+    export_all: BoolProperty(
+        name="Export All",
+        description="Also export textures which have not been modified "
+                    "since the import",
+        default=False,
+    )
+
+    def execute(self, context):
+        preferences = context.preferences
+        addon_prefs = preferences.addons[__name__].preferences
+        if not addon_prefs.conversion_allowed:
+            self.report(
+                {'ERROR'},
+                "Texture export is disabled because of non proper "
+                "texconv.exe configuration in the Add-on settings")
+            return {'CANCELLED'}
+
+        textures_dir = pathlib.Path(self.filepath)
+        if not textures_dir.is_dir():
+            textures_dir = textures_dir.parent
+        export_textures(textures_dir, pathlib.Path(addon_prefs.texconv_file),
+                        self.export_all, self.report)
 
         return {'FINISHED'}
 
@@ -709,7 +1820,7 @@ class MsfsGltfImporter(Operator, ImportHelper):
     filename_ext = ".gltf"
 
     filter_glob: StringProperty(
-        default="*.gltf",
+        default="*.gltf;*.glb",
         options={'HIDDEN'},
         maxlen=255,
     )
@@ -728,12 +1839,31 @@ class MsfsGltfImporter(Operator, ImportHelper):
         default='NO_IMPORT',
     )
 
+    update_existing: BoolProperty(
+        name="Update Existing",
+        description="Reuse the meshes, materials, images and objects of a "
+                    "previous import of this file and only rebuild the "
+                    "changed ones",
+        default=False,
+    )
+
+    streaming: BoolProperty(
+        name="Low Memory",
+        description="Process one mesh at a time and release intermediate "
+                    "data right away to bound the peak memory usage. The "
+                    "peak and current memory usage of each import stage "
+                    "gets reported",
+        default=False,
+    )
+
     def execute(self, context):
         preferences = context.preferences
         addon_prefs = preferences.addons[__name__].preferences
 
         ImportProperties.reset()
         ImportProperties.gltf_file = self.filepath
+        ImportProperties.update_existing = self.update_existing
+        ImportProperties.streaming = self.streaming
         if self.import_textures == 'LOAD_CONVERTED':
             ImportProperties.fs_base_path = pathlib.Path(
                 addon_prefs.fs_base_dir)
@@ -757,7 +1887,9 @@ class MsfsGltfImporter(Operator, ImportHelper):
                              ImportProperties.texconv_path,
                              ImportProperties.fs_base_path,
                              ImportProperties.import_textures_dir,
-                             ImportProperties.convert_textures_dirs)
+                             ImportProperties.convert_textures_dirs,
+                             ImportProperties.update_existing,
+                             ImportProperties.streaming)
 
         return {'FINISHED'}
 
@@ -832,7 +1964,13 @@ class MsfsGltfImporterPreferences(AddonPreferences):
 
 
 def menu_func_import(self, context):
-    self.layout.operator(MsfsGltfImporter.bl_idname, text="MSFS glTF (.gltf)")
+    self.layout.operator(MsfsGltfImporter.bl_idname,
+                         text="MSFS glTF (.gltf/.glb)")
+
+
+def menu_func_export(self, context):
+    self.layout.operator(MsfsTexturesExporter.bl_idname,
+                         text="MSFS Painted Textures (.dds)")
 
 
 def register():
@@ -840,7 +1978,9 @@ def register():
     bpy.utils.register_class(MsfsGltfImporter)
     bpy.utils.register_class(MsfsTexturesConverter)
     bpy.utils.register_class(MsfsTexturesImporter)
+    bpy.utils.register_class(MsfsTexturesExporter)
     bpy.types.TOPBAR_MT_file_import.append(menu_func_import)
+    bpy.types.TOPBAR_MT_file_export.append(menu_func_export)
 
 
 def unregister():
@@ -848,7 +1988,9 @@ def unregister():
     bpy.utils.unregister_class(MsfsGltfImporter)
     bpy.utils.unregister_class(MsfsTexturesConverter)
     bpy.utils.unregister_class(MsfsTexturesImporter)
+    bpy.utils.unregister_class(MsfsTexturesExporter)
     bpy.types.TOPBAR_MT_file_import.remove(menu_func_import)
+    bpy.types.TOPBAR_MT_file_export.remove(menu_func_export)
 
 
 if __name__ == "__main__":